@@ -16,11 +16,15 @@ import pathlib
 from collections import deque
 from typing import Optional
 import threading
+import itertools
+import heapq
+import time
 from concurrent.futures import ThreadPoolExecutor
 
 # Internal Imports
 from imports.functions import *
 from imports.global_setup import bot, config
+from imports.track_index import TrackIndex
 
 # Some variables
 max_file_size = int(config['files']['max_file_size']) * 1024 * 1024
@@ -92,8 +96,125 @@ class MusicQueue:
     def current_playing(self, title: str):
         self._current_playing = title
 
+# REST call priorities, lower goes first
+PRIORITY_PLAYBACK = 0
+PRIORITY_COSMETIC = 1
+
+class RestBudget:
+    """Global token bucket for REST calls, handing out permits by priority."""
+    def __init__(self, rate: int = 40, per: float = 1.0, max_wait: float = 2.0):
+        self.rate = rate
+        self.per = per
+        self.max_wait = max_wait  # Waiters older than this go first regardless of priority
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._waiters: list[tuple[int, int, float, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    def _take(self) -> bool:
+        now = time.monotonic()
+        self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate / self.per)
+        self._updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    async def acquire(self, priority: int = PRIORITY_COSMETIC):
+        if not self._waiters and self._take():
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), time.monotonic(), future))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        await future
+
+    async def _dispatch(self):
+        while self._waiters:
+            # Drop callers that gave up while waiting
+            while self._waiters and self._waiters[0][3].done():
+                heapq.heappop(self._waiters)
+            if not self._waiters:
+                break
+            if self._take():
+                self._next_waiter().set_result(None)
+            else:
+                await asyncio.sleep((1 - self._tokens) * self.per / self.rate)
+
+    def _next_waiter(self) -> asyncio.Future:
+        # Serve the oldest overdue waiter first so low priority calls can't starve
+        deadline = time.monotonic() - self.max_wait
+        overdue = [waiter for waiter in self._waiters if waiter[2] <= deadline and not waiter[3].done()]
+        if overdue:
+            # Left in the heap, it gets dropped once it reaches the top as done
+            return min(overdue, key=lambda waiter: waiter[1])[3]
+        return heapq.heappop(self._waiters)[3]
+
+class InteractionUpdater:
+    """Edits the deferred response of one interaction instead of sending followups."""
+    def __init__(self, ctx: discord.Interaction, min_interval: float = 1.5):
+        self.ctx = ctx
+        self.min_interval = min_interval
+        self._pending: Optional[str] = None
+        self._last_edit = time.monotonic()  # The deferred "thinking..." state covers the first interval
+        self._flush_task: Optional[asyncio.Task] = None
+        self._finished = False
+        self._lock = asyncio.Lock()  # Keeps edits in order, the final one last
+
+    def progress(self, content: str):
+        """Queue a cosmetic update, coalesced with any others in the same interval."""
+        if self._finished:
+            return
+        self._pending = content
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._delayed_flush())
+
+    async def _delayed_flush(self):
+        try:
+            # Keep going while updates arrive during an in-flight edit
+            while self._pending is not None and not self._finished:
+                delay = self._last_edit + self.min_interval - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                content, self._pending = self._pending, None
+                # Waiting for a permit can be cancelled, finish() then drops this edit
+                await rest_budget.acquire(PRIORITY_COSMETIC)
+                # Shielded so finish() waits for an edit already sent instead of racing it
+                await asyncio.shield(self._edit(content))
+        finally:
+            self._flush_task = None
+
+    async def finish(self, content: str):
+        """Send the final message right away, dropping any pending progress."""
+        self._finished = True
+        self._pending = None
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await rest_budget.acquire(PRIORITY_PLAYBACK)
+        await self._edit(content, final=True)
+
+    async def _edit(self, content: str, final: bool = False):
+        # The permit is taken before this, so the lock is only held while sending
+        async with self._lock:
+            if self._finished and not final:
+                return
+            self._last_edit = time.monotonic()
+            try:
+                await self.ctx.edit_original_response(content=content)
+            except discord.HTTPException as e:
+                print(f"Error updating interaction response: {e}")
+
 # Add this after other variables
 music_queues = {}  # Dictionary to store queues for each guild
+track_indexes = {}  # Known tracks for /play and /forceplay autocomplete, per guild
+rest_budget = RestBudget()  # Shared by every guild's interaction updates
+
+def get_track_index(guild_id: int) -> TrackIndex:
+    if guild_id not in track_indexes:
+        track_indexes[guild_id] = TrackIndex()
+    return track_indexes[guild_id]
 
 # Add this function to handle playing the next song in queue
 async def play_next(guild_id: int, voice_client: discord.VoiceClient):
@@ -124,8 +245,21 @@ async def play_next(guild_id: int, voice_client: discord.VoiceClient):
         queue.current_playing = title
 
 # Add this function to handle playlist extraction
-async def extract_playlist_info(url: str, ydl_opts: dict) -> list[tuple[str, str]]:
+async def extract_playlist_info(url: str, ydl_opts: dict, guild_id: int, on_entry=None) -> list[tuple[str, str]]:
     """Extract all video URLs and titles from a playlist."""
+    if on_entry is not None:
+        loop = asyncio.get_running_loop()
+
+        def match_filter(info, incomplete=False):
+            # yt-dlp calls this from the executor for each playlist entry as its page is fetched,
+            # only those carry a playlist_autonumber
+            found = info.get('playlist_autonumber')
+            if found:
+                loop.call_soon_threadsafe(on_entry, found)
+            return None
+
+        ydl_opts = {**ydl_opts, 'match_filter': match_filter}
+
     try:
         with youtube_dl.YoutubeDL(ydl_opts) as ydl:
             info = await asyncio.get_event_loop().run_in_executor(
@@ -134,9 +268,13 @@ async def extract_playlist_info(url: str, ydl_opts: dict) -> list[tuple[str, str
             
             if 'entries' in info:
                 # This is a playlist
+                track_index = get_track_index(guild_id)
+                for entry in info['entries']:
+                    track_index.add(entry.get('webpage_url') or entry['url'], entry['title'])
                 return [(entry['url'], entry['title']) for entry in info['entries']]
             else:
                 # This is a single video
+                get_track_index(guild_id).add(info.get('webpage_url') or url, info['title'])
                 return [(info['url'], info['title'])]
     except Exception as e:
         print(f"Error extracting playlist: {e}")
@@ -183,9 +321,11 @@ async def leave_voice_channel(ctx: discord.Interaction):
 @bot.tree.command(name="play", description="Adds song(s) to the queue (supports playlists)")
 async def play(ctx: discord.Interaction, url: str):
     await ctx.response.defer(thinking=True)
+    url = get_track_index(ctx.guild.id).resolve(url)
+    updater = InteractionUpdater(ctx)
 
     if not ctx.user.voice:
-        await ctx.followup.send("You are not in a voice channel.")
+        await updater.finish("You are not in a voice channel.")
         return
 
     channel = ctx.user.voice.channel
@@ -208,15 +348,16 @@ async def play(ctx: discord.Interaction, url: str):
         }
 
         # Extract playlist info in a separate thread
-        tracks = await extract_playlist_info(url, ydl_opts)
+        tracks = await extract_playlist_info(
+            url, ydl_opts, ctx.guild.id,
+            on_entry=lambda found: updater.progress(f"Adding tracks to queue... ({found} found so far)")
+        )
         
         if not tracks:
-            await ctx.followup.send("No tracks found in the URL.")
+            await updater.finish("No tracks found in the URL.")
             return
 
         is_playlist = len(tracks) > 1
-        if is_playlist:
-            await ctx.followup.send(f"Adding {len(tracks)} tracks to queue...")
 
         first_track = True
         for track_url, track_title in tracks:
@@ -224,7 +365,7 @@ async def play(ctx: discord.Interaction, url: str):
                 # Add to queue
                 queue.add(track_url, track_title)
                 if not is_playlist:  # Only send message for single tracks
-                    await ctx.followup.send(f"Added to queue: {track_title}")
+                    await updater.finish(f"Added to queue: {track_title}")
             else:
                 # Play first track immediately
                 ffmpeg_options = {
@@ -244,16 +385,16 @@ async def play(ctx: discord.Interaction, url: str):
                 voice_client.source = transformer
                 queue.current_playing = track_title
                 if not is_playlist:  # Only send message for single tracks
-                    await ctx.followup.send(f"Now playing: {track_title}")
+                    await updater.finish(f"Now playing: {track_title}")
             
             first_track = False
 
         if is_playlist:
-            await ctx.followup.send(f"Successfully added playlist to queue! Use /queue to see the full list.")
+            await updater.finish(f"Successfully added {len(tracks)} tracks to queue! Use /queue to see the full list.")
 
     except Exception as e:
         print(f"Error playing audio: {e}")
-        await ctx.followup.send("There was an error trying to play the audio.")
+        await updater.finish("There was an error trying to play the audio.")
 
 @bot.tree.command(name="stop", description="Stops the currently playing audio.")
 async def stop(ctx: discord.Interaction):
@@ -300,9 +441,11 @@ async def volume(ctx: discord.Interaction, percentage: int):
 @bot.tree.command(name="forceplay", description="Forces a song to play immediately, stopping the current song")
 async def forceplay(ctx: discord.Interaction, url: str):
     await ctx.response.defer(thinking=True)
+    url = get_track_index(ctx.guild.id).resolve(url)
+    updater = InteractionUpdater(ctx)
 
     if not ctx.user.voice:
-        await ctx.followup.send("You are not in a voice channel.")
+        await updater.finish("You are not in a voice channel.")
         return
 
     channel = ctx.user.voice.channel
@@ -324,9 +467,13 @@ async def forceplay(ctx: discord.Interaction, url: str):
                 info = ydl.extract_info(url, download=False, process=True)
             
             if 'entries' in info:
+                # Never fall back to the input URL here, it may be a whole playlist
+                entry = info['entries'][0]
+                get_track_index(ctx.guild.id).add(entry.get('webpage_url') or entry.get('url'), entry['title'])
                 url = info['entries'][0]['url']
                 title = info['entries'][0]['title']
             else:
+                get_track_index(ctx.guild.id).add(info.get('webpage_url') or url, info['title'])
                 url = info['url']
                 title = info['title']
 
@@ -351,11 +498,21 @@ async def forceplay(ctx: discord.Interaction, url: str):
         if ctx.guild.id in music_queues:
             music_queues[ctx.guild.id].current_playing = title
 
-        await ctx.followup.send(f"Now playing: {title} (Queue will continue after this song)")
+        await updater.finish(f"Now playing: {title} (Queue will continue after this song)")
 
     except Exception as e:
         print(f"Error playing audio: {e}")
-        await ctx.followup.send("There was an error trying to play the audio.")
+        await updater.finish("There was an error trying to play the audio.")
+
+# Autocomplete for the url argument, served only from the in-memory index
+@play.autocomplete('url')
+@forceplay.autocomplete('url')
+async def url_autocomplete(ctx: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
+    track_index = track_indexes.get(ctx.guild.id)
+    return [
+        app_commands.Choice(name=title[:100], value=url)
+        for title, url in track_index.search(current)
+    ] if track_index else []
 
 # Add the skip command
 @bot.tree.command(name="skip", description="Skips the currently playing song")
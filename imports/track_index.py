@@ -0,0 +1,104 @@
+# External Imports
+import itertools
+import heapq
+import re
+
+class TrackIndex:
+    """In-memory prefix/trigram index of known tracks, used for autocomplete."""
+    def __init__(self, max_entries: int = 5000):
+        self.max_entries = max_entries
+        self.entries: dict[str, tuple[str, str]] = {}  # url -> (title, normalized title), oldest first
+        self._titles: dict[str, set[str]] = {}  # normalized title -> urls
+        self._trigrams: dict[str, set[str]] = {}
+        self._prefixes: dict[str, set[str]] = {}
+        self._seen: dict[str, int] = {}  # url -> recency counter
+        self._counter = 0
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return ' '.join(re.sub(r'[^\w]+', ' ', text.lower()).split())
+
+    @staticmethod
+    def _grams(text: str) -> set[str]:
+        padded = f" {text} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    @staticmethod
+    def _word_prefixes(text: str) -> set[str]:
+        return {word[:n] for word in text.split() for n in (1, 2)}
+
+    def add(self, url: str, title: str):
+        # Discord choice values are capped at 100 characters
+        if not url or not title or len(url) > 100:
+            return
+        key = self._normalize(title)
+        if not key:
+            return
+
+        self._counter += 1
+        if url in self.entries:
+            if self.entries[url][1] == key:
+                # Refresh recency without touching the postings
+                del self.entries[url]
+                self.entries[url] = (title, key)
+                self._seen[url] = self._counter
+                return
+            # Same track under a new title, reindex it
+            self._remove(url)
+
+        self.entries[url] = (title, key)
+        self._seen[url] = self._counter
+        self._titles.setdefault(key, set()).add(url)
+        for gram in self._grams(key):
+            self._trigrams.setdefault(gram, set()).add(url)
+        for prefix in self._word_prefixes(key):
+            self._prefixes.setdefault(prefix, set()).add(url)
+
+        if len(self.entries) > self.max_entries:
+            self._remove(next(iter(self.entries)))
+
+    def _remove(self, url: str):
+        _, key = self.entries.pop(url)
+        self._seen.pop(url, None)
+        for index, tokens in (
+            (self._titles, (key,)),
+            (self._trigrams, self._grams(key)),
+            (self._prefixes, self._word_prefixes(key)),
+        ):
+            for token in tokens:
+                urls = index.get(token)
+                if urls is not None:
+                    urls.discard(url)
+                    if not urls:
+                        del index[token]
+
+    def resolve(self, value: str) -> str:
+        """Map a typed title back to its most recent URL, otherwise return the value unchanged."""
+        urls = self._titles.get(self._normalize(value))
+        return max(urls, key=self._seen.__getitem__) if urls else value
+
+    def search(self, query: str, limit: int = 25) -> list[tuple[str, str]]:
+        """Return up to `limit` (title, url) pairs matching the query, best first."""
+        query = self._normalize(query)
+        if not query:
+            # Nothing typed yet, suggest the most recent tracks
+            return [(self.entries[url][0], url) for url in itertools.islice(reversed(self.entries), limit)]
+
+        if len(query) < 3:
+            scored = [(1.0, url) for url in self._prefixes.get(query, ())]
+        else:
+            grams = self._grams(query)
+            counts: dict[str, int] = {}
+            for gram in grams:
+                for url in self._trigrams.get(gram, ()):
+                    counts[url] = counts.get(url, 0) + 1
+            # Require at least half of the query trigrams to keep noise out
+            threshold = max(1, len(grams) // 2)
+            scored = [(count / len(grams), url) for url, count in counts.items() if count >= threshold]
+
+        best = heapq.nsmallest(limit, scored, key=lambda item: (
+            not self.entries[item[1]][1].startswith(query),  # Title prefix matches first
+            -item[0],
+            -self._seen[item[1]],  # Then most recently seen
+        ))
+        return [(self.entries[url][0], url) for _, url in best]
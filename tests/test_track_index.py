@@ -0,0 +1,86 @@
+from imports.track_index import TrackIndex
+
+
+def test_prefix_matches_rank_before_fuzzy_matches():
+    index = TrackIndex()
+    index.add("https://youtu.be/a", "Remix of Never Gonna Give You Up")
+    index.add("https://youtu.be/b", "Never Gonna Give You Up")
+    index.add("https://youtu.be/c", "Something Else")
+
+    assert index.search("never gonna") == [
+        ("Never Gonna Give You Up", "https://youtu.be/b"),
+        ("Remix of Never Gonna Give You Up", "https://youtu.be/a"),
+    ]
+
+
+def test_short_queries_use_word_prefixes():
+    index = TrackIndex()
+    index.add("https://youtu.be/a", "Bohemian Rhapsody")
+    index.add("https://youtu.be/b", "Another One Bites the Dust")
+
+    assert [url for _, url in index.search("rh")] == ["https://youtu.be/a"]
+    assert index.search("zz") == []
+
+
+def test_trigram_threshold_drops_weak_matches():
+    index = TrackIndex()
+    index.add("https://youtu.be/a", "Never Gonna Give You Up")
+
+    # One typo still shares most trigrams
+    assert index.search("never gona") == [("Never Gonna Give You Up", "https://youtu.be/a")]
+    # A single shared trigram is below the threshold
+    assert index.search("qwerty ne") == []
+
+
+def test_recency_breaks_ties():
+    index = TrackIndex()
+    index.add("https://youtu.be/a", "Song A")
+    index.add("https://youtu.be/b", "Song B")
+    assert [url for _, url in index.search("so")] == ["https://youtu.be/b", "https://youtu.be/a"]
+
+    index.add("https://youtu.be/a", "Song A")
+    assert [url for _, url in index.search("so")] == ["https://youtu.be/a", "https://youtu.be/b"]
+    assert [url for _, url in index.search("")] == ["https://youtu.be/a", "https://youtu.be/b"]
+
+
+def test_eviction_cleans_up_postings():
+    index = TrackIndex(max_entries=2)
+    index.add("https://youtu.be/a", "Alpha")
+    index.add("https://youtu.be/b", "Bravo")
+    index.add("https://youtu.be/c", "Charlie")
+
+    assert list(index.entries) == ["https://youtu.be/b", "https://youtu.be/c"]
+    assert index.search("alpha") == []
+    assert index.resolve("Alpha") == "Alpha"
+    for postings in (index._trigrams, index._prefixes, index._titles):
+        assert all("https://youtu.be/a" not in urls for urls in postings.values())
+    assert "al" not in index._prefixes
+
+
+def test_urls_over_discord_limit_are_skipped():
+    index = TrackIndex()
+    index.add("https://example.com/" + "a" * 81, "Too Long")
+    index.add("https://example.com/" + "a" * 80, "Just Fits")
+
+    assert [title for title, _ in index.search("")] == ["Just Fits"]
+
+
+def test_same_title_keeps_both_urls():
+    index = TrackIndex()
+    index.add("https://youtu.be/a", "Song (Live)")
+    index.add("https://youtu.be/b", "Song - Live")
+
+    assert {url for _, url in index.search("song live")} == {"https://youtu.be/a", "https://youtu.be/b"}
+    assert index.resolve("song live") == "https://youtu.be/b"
+    index.add("https://youtu.be/a", "Song (Live)")
+    assert index.resolve("song live") == "https://youtu.be/a"
+
+
+def test_retitled_url_is_reindexed():
+    index = TrackIndex()
+    index.add("https://youtu.be/a", "Morning Walk")
+    index.add("https://youtu.be/a", "Evening Run")
+
+    assert index.search("morning walk") == []
+    assert index.search("evening run") == [("Evening Run", "https://youtu.be/a")]
+    assert index.resolve("Morning Walk") == "Morning Walk"